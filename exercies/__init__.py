@@ -1,2 +1,12 @@
-from .exercies import run_exercies
-from . import models
\ No newline at end of file
+__version__ = "0.2.0"
+
+from ._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "run_exercies": ".exercies",
+    "models": None,
+    "cache": None,
+    "instrumentation": None,
+    "optimization": None,
+    "validation": None,
+})
@@ -0,0 +1,42 @@
+"""
+Lazy loading of package attributes
+
+Packages expose their classes without importing the modules that define
+them until first use (PEP 562), so short-lived scripts only pay for what
+they touch.
+"""
+
+import importlib
+
+def attach(package: str, attributes: dict):
+    """
+    Build the module-level __getattr__, __dir__ and __all__ of a package.
+
+    Parameters:
+    package (str): Name of the package (its __name__).
+    attributes (dict): Attribute name mapped to the relative module defining
+        it, or mapped to None for a submodule of the same name.
+
+    Returns:
+    tuple: (__getattr__, __dir__, __all__) for the package.
+    """
+
+    def __getattr__(name: str):
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        module = attributes[name]
+        if module is None:
+            value = importlib.import_module(f".{name}", package)
+        else:
+            value = getattr(importlib.import_module(module, package), name)
+
+        # Cache it in the package so later lookups skip __getattr__.
+        setattr(importlib.import_module(package), name, value)
+
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(importlib.import_module(package))) | set(attributes))
+
+    return __getattr__, __dir__, list(attributes)
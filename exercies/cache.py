@@ -0,0 +1,477 @@
+"""
+Persistent on-disk cache of model results
+
+Results are stored in an SQLite database in WAL mode so several processes
+can share it. Entries are keyed by a hash of the model class, the library
+version and a fingerprint of the source of the model, its base classes and
+the helpers they use (so changing a formula invalidates its entries even
+without a version bump), followed by the parameters. The least recently
+used entries are evicted once the database grows past its size bound.
+
+Usage:
+
+    with ResultCache("results.sqlite") as cache:
+        results = cache.evaluate_many(models)
+        # One model built from parameter arrays, one entry per scenario.
+        arrays = cache.evaluate_array(MM1Uncapped(np.linspace(1, 9, 10**5), 10))
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+import sys
+import time
+import types
+
+import numpy as np
+
+from . import __version__
+from .instrumentation import record_cache
+from .models.sensitivity import METRICS
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Hits refresh the access time of an entry at most once per this many seconds.
+ACCESS_RESOLUTION = 60.0
+
+FIELDS = (*METRICS, "P0")
+
+# Parameters every model accepts as arrays, the rest are integers.
+RATE_PARAMETERS = ("lmbda", "mu")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    {", ".join(f"{name} REAL" for name in FIELDS)},
+    stationary BLOB,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+def model_key(model) -> str:
+    """
+    Calculate the canonical cache key of a model.
+
+    Parameters:
+    model: Queue model instance.
+
+    Returns:
+    str: Key identifying the model class, parameters, library version and
+    model source.
+    """
+
+    arrays = _parameters(model)
+    if any(array.ndim for array in arrays):
+        raise ValueError("Models built from arrays have one key per scenario, use model_keys().")
+
+    return _keys(type(model), arrays)[0]
+
+def model_keys(model) -> list[str]:
+    """
+    Calculate the cache keys of every scenario of a model whose parameters
+    may be arrays. Parameters are broadcast together.
+
+    Parameters:
+    model: Queue model instance.
+
+    Returns:
+    list[str]: Key of each scenario, in flattened (C) order.
+    """
+
+    return _keys(type(model), np.broadcast_arrays(*_parameters(model)))
+
+def _parameters(model) -> list:
+    return [np.asarray(getattr(model, name)) for name in _parameter_names(type(model))]
+
+def _keys(cls: type, arrays: list) -> list[str]:
+    """
+    Keys of broadcast parameter arrays: the class prefix followed by the
+    hex of each scenario's parameters as big-endian float64, so numbers
+    are compared by value (lmbda=2 and lmbda=2.0 share a key). The hex of
+    the whole batch is built at once and sliced per scenario.
+    """
+
+    table = np.column_stack([np.asarray(array, dtype=">f8").ravel() for array in arrays])
+    raw = table.tobytes().hex()
+    width = 2 * table.itemsize * table.shape[1]
+    prefix = _key_prefix(cls)
+
+    return [prefix + raw[i:i + width] for i in range(0, len(raw), width)]
+
+@functools.cache
+def _key_prefix(cls: type) -> str:
+    names = ",".join(_parameter_names(cls))
+    canonical = f"{cls.__module__}.{cls.__qualname__}({names})@{__version__}#{_source_fingerprint(cls)}"
+
+    return hashlib.sha256(canonical.encode()).hexdigest()[:32] + ":"
+
+def _source_fingerprint(cls: type) -> str:
+    """
+    Hash of the source files a model depends on (see _source_modules).
+    Files that can't be read are skipped.
+    """
+
+    digest = hashlib.sha256()
+    for name, module in sorted(_source_modules(cls).items()):
+        try:
+            with open(inspect.getsourcefile(module), "rb") as file:
+                digest.update(name.encode() + b"\0" + file.read())
+        except (OSError, TypeError):
+            pass
+
+    return digest.hexdigest()
+
+def _source_modules(cls: type) -> dict:
+    """
+    Modules defining every class in the MRO of a model, plus the package
+    modules those import helpers from (like backend and sensitivity).
+    """
+
+    package = __name__.split(".")[0]
+    modules = {}
+    for base in cls.__mro__:
+        module = sys.modules.get(base.__module__)
+        if module is None or base is object:
+            continue
+        modules[module.__name__] = module
+        for value in vars(module).values():
+            name = value.__name__ if isinstance(value, types.ModuleType) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.split(".")[0] == package and name in sys.modules:
+                modules[name] = sys.modules[name]
+
+    return modules
+
+@functools.cache
+def _parameter_names(cls: type) -> tuple[str, ...]:
+    return tuple(name for name in inspect.signature(cls.__init__).parameters if name != "self")
+
+def compute_result(model) -> dict:
+    """
+    Calculate the results stored in the cache for a model: the metrics in
+    METRICS, P0 and, for finite models, the stationary distribution.
+
+    Parameters:
+    model: Queue model instance.
+
+    Returns:
+    dict: Metric name mapped to its value, plus "stationary" if available.
+    """
+
+    result = {name: float(getattr(model, method)()) for name, method in METRICS.items()}
+    result["P0"] = float(model.probability_of_zero_units())
+
+    if hasattr(model, "stationary_distribution"):
+        result["stationary"] = np.asarray(model.stationary_distribution(), dtype=np.float64)
+
+    return result
+
+def compute_results(model, count: int) -> tuple:
+    """
+    Calculate the results of a model built from parameter arrays in one
+    pass, for the scenarios flattened in C order.
+
+    Parameters:
+    model: Queue model instance.
+    count (int): Number of scenarios.
+
+    Returns:
+    tuple: (values, stationary), values a (count, len(FIELDS)) array and
+    stationary a (count, states) array, or None for infinite models.
+    """
+
+    # Past the float range the closed forms overflow towards their limits.
+    with np.errstate(over="ignore"):
+        columns = [getattr(model, method)() for method in METRICS.values()]
+        columns.append(model.probability_of_zero_units())
+        values = np.column_stack([np.broadcast_to(np.asarray(column, dtype=np.float64), (count,)) for column in columns])
+
+        stationary = None
+        if hasattr(model, "stationary_distribution"):
+            stationary = np.asarray(model.stationary_distribution(), dtype=np.float64).reshape(count, -1)
+
+    return values, stationary
+
+def _groups(names: tuple, arrays: list):
+    """
+    Split flattened scenarios by the values of their integer parameters.
+
+    Yields:
+    tuple: (positions of the group, keyword arguments of its array-built model).
+    """
+
+    rates = [i for i, name in enumerate(names) if name in RATE_PARAMETERS]
+    others = [i for i in range(len(names)) if i not in rates]
+    if others:
+        _, inverse = np.unique(np.column_stack([arrays[i] for i in others]), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+    else:
+        inverse = np.zeros(len(arrays[0]), dtype=np.intp)
+
+    order = np.argsort(inverse, kind="stable")
+    for group in np.split(order, np.flatnonzero(np.diff(inverse[order])) + 1):
+        # Lone scenarios take the scalar path, cheaper than one-element arrays.
+        params = {names[i]: arrays[i][group] if len(group) > 1 else arrays[i][group[0]].item() for i in rates}
+        params.update({names[i]: arrays[i][group[0]].item() for i in others})
+        yield group, params
+
+class ResultCache:
+    """
+    Class to represent a size-bounded persistent cache of model results.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache.
+
+        Parameters:
+        path (str): SQLite database file.
+        max_bytes (int): Approximate bound of the size of the stored results.
+        """
+
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive.")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, timeout=30.0, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+
+        self._connection.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_many(self, keys: list[str]) -> dict:
+        """
+        Look up several keys with a single query and mark them as used.
+
+        Parameters:
+        keys (list[str]): Cache keys.
+
+        Returns:
+        dict: Key mapped to its result, for the keys found.
+        """
+
+        found = {}
+        for index, _, stationary, *values in self._fetch(keys):
+            result = dict(zip(FIELDS, values))
+            if stationary is not None:
+                result["stationary"] = np.frombuffer(stationary, dtype=np.float64)
+            found[keys[index]] = result
+
+        return found
+
+    def _fetch(self, keys: list[str]) -> list:
+        """
+        Look up several keys with a single query and mark them as used.
+
+        Returns:
+        list: (position in keys, access time, stationary bytes, *FIELDS)
+        rows of the keys found.
+        """
+
+        if not keys:
+            return []
+
+        now = time.time()
+        rows = self._connection.execute(
+            # CROSS JOIN keeps json_each as the outer loop: one primary key probe per key.
+            f"SELECT requested.key, accessed, stationary, {', '.join(FIELDS)} "
+            "FROM json_each(?) AS requested CROSS JOIN results ON results.key = requested.value",
+            (json.dumps(keys),),
+        ).fetchall()
+
+        cutoff = now - ACCESS_RESOLUTION
+        stale = [keys[index] for index, accessed, *_ in rows if accessed < cutoff]
+        if stale:
+            self._connection.execute(
+                "UPDATE results SET accessed = ? WHERE key IN (SELECT value FROM json_each(?))",
+                (now, json.dumps(stale)),
+            )
+
+        return rows
+
+    def put_many(self, items: dict):
+        """
+        Store several results in a single transaction and evict the least
+        recently used entries if the cache grew past its size bound.
+
+        Parameters:
+        items (dict): Key mapped to its result.
+        """
+
+        rows = []
+        for key, result in items.items():
+            stationary = result.get("stationary")
+            stationary = None if stationary is None else np.asarray(stationary, dtype=np.float64).tobytes()
+            rows.append((key, *(result[name] for name in FIELDS), stationary))
+
+        self._insert(rows)
+
+    def _insert(self, rows: list):
+        """
+        Store (key, *FIELDS, stationary bytes) rows in a single transaction
+        and evict the least recently used entries if needed.
+        """
+
+        if not rows:
+            return
+
+        now = time.time()
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO results (key, {', '.join(FIELDS)}, stationary, size, accessed) "
+                f"VALUES ({', '.join('?' * (len(FIELDS) + 4))})",
+                [
+                    (*row, len(row[0]) + 8 * len(FIELDS) + (len(row[-1]) if row[-1] is not None else 0), now)
+                    for row in rows
+                ],
+            )
+            self._evict()
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _evict(self):
+        (total,) = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        self._connection.execute(
+            """
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running FROM results
+                ) WHERE running > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+    def evaluate(self, model) -> dict:
+        """
+        Get the results of a model, computing and storing them on a miss.
+
+        Parameters:
+        model: Queue model instance.
+
+        Returns:
+        dict: Results of the model (see compute_result).
+        """
+
+        return self.evaluate_many([model])[0]
+
+    def evaluate_many(self, models: list) -> list[dict]:
+        """
+        Get the results of several models with one lookup query and one
+        insert transaction for the misses.
+
+        Parameters:
+        models (list): Queue model instances.
+
+        Returns:
+        list[dict]: Results of each model, in the same order.
+        """
+
+        keys = [model_key(model) for model in models]
+
+        return self._evaluate_keys(keys, lambda i: models[i])
+
+    def evaluate_array(self, model) -> dict:
+        """
+        Get the results of a model built from parameter arrays, one cache
+        entry per scenario, with one lookup query and one insert transaction
+        for the misses. Missing scenarios are computed with one array-built
+        model per combination of the integer parameters (lambda and mu are
+        passed as arrays).
+
+        Parameters:
+        model: Queue model instance, parameters broadcast together.
+
+        Returns:
+        dict: Metric name mapped to an array shaped like the broadcast
+        parameters. "stationary" adds a trailing axis over the states, or is
+        a flat list of arrays when their lengths differ.
+        """
+
+        cls = type(model)
+        broadcast = np.broadcast_arrays(*_parameters(model))
+        shape = broadcast[0].shape
+        arrays = [array.ravel() for array in broadcast]
+        keys = _keys(cls, arrays)
+        count = len(keys)
+
+        rows = self._fetch(keys)
+        found = np.zeros(count, dtype=bool)
+        values = np.empty((count, len(FIELDS)))
+        # Stationary distributions as stored bytes, decoded once at the end.
+        blobs = [None] * count
+        if rows:
+            index = np.fromiter((row[0] for row in rows), dtype=np.intp, count=len(rows))
+            found[index] = True
+            values[index] = [row[3:] for row in rows]
+            for row in rows:
+                blobs[row[0]] = row[2]
+
+        missing = np.flatnonzero(~found)
+        record_cache("ResultCache.evaluate", True, count - len(missing))
+        record_cache("ResultCache.evaluate", False, len(missing))
+
+        if len(missing):
+            new_rows = []
+            for group, params in _groups(_parameter_names(cls), [array[missing] for array in arrays]):
+                group_values, group_stationary = compute_results(cls(**params), len(group))
+                values[missing[group]] = group_values
+                for i, position in enumerate(missing[group].tolist()):
+                    blobs[position] = None if group_stationary is None else group_stationary[i].tobytes()
+                    new_rows.append((keys[position], *group_values[i].tolist(), blobs[position]))
+            self._insert(new_rows)
+
+        stacked = {name: values[:, i].reshape(shape) for i, name in enumerate(FIELDS)}
+        if count and blobs[0] is not None:
+            if len(set(map(len, blobs))) == 1:
+                stacked["stationary"] = np.frombuffer(b"".join(blobs), dtype=np.float64).reshape(*shape, -1)
+            else:
+                stacked["stationary"] = [np.frombuffer(blob, dtype=np.float64) for blob in blobs]
+
+        return stacked
+
+    def _evaluate_keys(self, keys: list[str], build) -> list[dict]:
+        found = self.get_many(keys)
+
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in found and key not in missing:
+                missing[key] = compute_result(build(i))
+        self.put_many(missing)
+
+        hits = sum(key in found for key in keys)
+        record_cache("ResultCache.evaluate", True, hits)
+        record_cache("ResultCache.evaluate", False, len(keys) - hits)
+
+        found.update(missing)
+
+        return [found[key] for key in keys]
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+
+        self._connection.execute("DELETE FROM results")
+
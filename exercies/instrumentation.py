@@ -0,0 +1,310 @@
+"""
+Opt-in instrumentation of call counts, latencies and cache accesses
+
+Registered methods are only wrapped while some measurement is open, so the
+models run their plain code (no overhead at all) when it's disabled. The
+open recorders are tracked per context (thread or asyncio task): calls made
+from other threads while a block is open go through the wrapper but aren't
+recorded.
+
+Usage:
+
+    with instrument() as recorder:
+        MODEL.time_in_system_mean()
+    recorder.write_prometheus("metrics.prom")
+"""
+
+import contextvars
+import functools
+import threading
+import time
+import types
+from contextlib import contextmanager
+
+# Latency samples kept per method for percentiles (reservoir sampling).
+SAMPLE_SIZE = 4096
+PERCENTILES = (0.5, 0.9, 0.99)
+
+_targets = []
+_open_blocks = 0
+_lock = threading.RLock()
+
+# Recorders of the instrument() blocks open in the current context.
+_active = contextvars.ContextVar("exercies_instrumentation_recorders", default=())
+
+class MethodStats:
+    """
+    Class to accumulate the measurements of a single method.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty measurements.
+        """
+
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add_call(self, seconds: float):
+        """
+        Record one call.
+
+        Parameters:
+        seconds (float): Duration of the call.
+        """
+
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(seconds)
+        else:
+            import random
+
+            index = random.randrange(self.calls)
+            if index < SAMPLE_SIZE:
+                self.samples[index] = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Calculate a latency percentile from the sampled calls.
+
+        Parameters:
+        q (float): Quantile between 0 and 1.
+
+        Returns:
+        float: Latency in seconds at the quantile.
+        """
+
+        if not self.samples:
+            return 0.0
+
+        ordered = sorted(self.samples)
+
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def to_dict(self) -> dict:
+        """
+        Export the measurements.
+
+        Returns:
+        dict: Measurements of the method.
+        """
+
+        return {
+            "calls": self.calls,
+            "total_seconds": self.total_seconds,
+            "max_seconds": self.max_seconds,
+            "percentiles": {str(q): self.percentile(q) for q in PERCENTILES},
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+class Recorder:
+    """
+    Class to hold the measurements taken inside an instrument() block.
+    Times are inclusive of nested instrumented calls.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty recorder.
+        """
+
+        self.stats = {}
+
+    def _get(self, name: str) -> MethodStats:
+        if name not in self.stats:
+            self.stats[name] = MethodStats()
+
+        return self.stats[name]
+
+    def snapshot(self) -> dict:
+        """
+        Export the measurements of every method called.
+
+        Returns:
+        dict: Method name mapped to its measurements.
+        """
+
+        with _lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_json(self) -> str:
+        """
+        Export the measurements as JSON.
+
+        Returns:
+        str: JSON document.
+        """
+
+        import json
+
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Export the measurements in the Prometheus text exposition format.
+
+        Returns:
+        str: Prometheus metrics.
+        """
+
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP exercies_call_seconds Latency of instrumented methods.",
+            "# TYPE exercies_call_seconds summary",
+        ]
+        for name, stats in snapshot.items():
+            for q, value in stats["percentiles"].items():
+                lines.append(f'exercies_call_seconds{{method="{name}",quantile="{q}"}} {value!r}')
+            lines.append(f'exercies_call_seconds_sum{{method="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'exercies_call_seconds_count{{method="{name}"}} {stats["calls"]}')
+
+        for metric in ("cache_hits", "cache_misses"):
+            lines.append(f"# HELP exercies_{metric}_total Cache accesses of instrumented methods.")
+            lines.append(f"# TYPE exercies_{metric}_total counter")
+            for name, stats in snapshot.items():
+                lines.append(f'exercies_{metric}_total{{method="{name}"}} {stats[metric]}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str):
+        """
+        Write the measurements as a JSON file.
+
+        Parameters:
+        path (str): Output file.
+        """
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+
+    def write_prometheus(self, path: str):
+        """
+        Write the measurements as a Prometheus text file.
+
+        Parameters:
+        path (str): Output file.
+        """
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+
+def register(owner, attribute: str, name: str):
+    """
+    Register a function to be measured while instrumentation is active.
+
+    Parameters:
+    owner (type | module): Object holding the function.
+    attribute (str): Attribute name of the function in owner.
+    name (str): Name the measurements are reported under.
+    """
+
+    with _lock:
+        _targets.append((owner, attribute, name))
+        # Modules imported lazily inside an instrument() block.
+        if _open_blocks:
+            setattr(owner, attribute, _wrap(getattr(owner, attribute), name))
+
+def instrumented(cls: type) -> type:
+    """
+    Class decorator registering every method defined in the class.
+
+    Parameters:
+    cls (type): Class to instrument.
+
+    Returns:
+    type: The same class.
+    """
+
+    for attribute, value in list(vars(cls).items()):
+        if isinstance(value, types.FunctionType) and not attribute.startswith("__"):
+            register(cls, attribute, f"{cls.__name__}.{attribute}")
+
+    return cls
+
+def record_cache(name: str, hit: bool, count: int = 1):
+    """
+    Record cache accesses of a method. Does nothing if not instrumenting.
+
+    Parameters:
+    name (str): Method name, as reported by the recorder.
+    hit (bool): Whether the values were found in the cache.
+    count (int): Number of accesses, for batched lookups.
+    """
+
+    recorders = _active.get()
+    if not recorders:
+        return
+
+    with _lock:
+        for recorder in recorders:
+            stats = recorder._get(name)
+            if hit:
+                stats.cache_hits += count
+            else:
+                stats.cache_misses += count
+
+def _wrap(function, name: str):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        recorders = _active.get()
+        if not recorders:
+            return function(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                for recorder in recorders:
+                    recorder._get(name).add_call(elapsed)
+
+    wrapper.__wrapped_original__ = function
+
+    return wrapper
+
+def _patch():
+    for owner, attribute, name in _targets:
+        setattr(owner, attribute, _wrap(getattr(owner, attribute), name))
+
+def _unpatch():
+    for owner, attribute, _ in _targets:
+        setattr(owner, attribute, getattr(owner, attribute).__wrapped_original__)
+
+@contextmanager
+def instrument():
+    """
+    Measure the instrumented functions called inside the block, from the
+    current thread or task. Blocks can be nested; each recorder only sees
+    the calls made inside its own block.
+
+    Returns:
+    Recorder: Measurements taken inside the block.
+    """
+
+    global _open_blocks
+
+    recorder = Recorder()
+
+    with _lock:
+        if not _open_blocks:
+            _patch()
+        _open_blocks += 1
+    token = _active.set(_active.get() + (recorder,))
+
+    try:
+        yield recorder
+    finally:
+        _active.reset(token)
+        with _lock:
+            _open_blocks -= 1
+            if not _open_blocks:
+                _unpatch()
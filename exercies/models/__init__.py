@@ -1,2 +1,9 @@
-from .mm1 import MM1Uncapped, MM1CappedPopulation, MM1CappedSystem
-from .mms import MMSUncapped
\ No newline at end of file
+from .._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "MM1Uncapped": ".mm1",
+    "MM1CappedPopulation": ".mm1",
+    "MM1CappedSystem": ".mm1",
+    "MMSUncapped": ".mms",
+    "MMSCappedPopulation": ".mms",
+})
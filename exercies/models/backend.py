@@ -0,0 +1,49 @@
+"""
+Scalar fast path with NumPy loaded on demand
+
+The closed-form models work on plain floats with the math module; NumPy is
+only imported when a model is given arrays or an array result is needed.
+"""
+
+import math
+
+def numpy():
+    """
+    Import NumPy on first use.
+
+    Returns:
+    module: The numpy module.
+    """
+
+    import numpy
+
+    return numpy
+
+def any_true(condition) -> bool:
+    """
+    Check a condition that may be a bool or an array of bools.
+
+    Parameters:
+    condition (bool | ndarray): Condition to check.
+
+    Returns:
+    bool: Whether the condition holds anywhere.
+    """
+
+    return bool(condition.any()) if hasattr(condition, "any") else bool(condition)
+
+def exp(x):
+    """
+    Calculate the exponential of a scalar or an array.
+
+    Parameters:
+    x (float | ndarray): Exponent.
+
+    Returns:
+    float | ndarray: e**x.
+    """
+
+    if isinstance(x, (int, float)):
+        return math.exp(x)
+
+    return numpy().exp(x)
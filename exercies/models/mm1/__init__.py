@@ -1,3 +1,7 @@
-from .uncapped import MM1Uncapped
-from .capped_population import MM1CappedPopulation
-from .capped_system import MM1CappedSystem
\ No newline at end of file
+from ..._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "MM1Uncapped": ".uncapped",
+    "MM1CappedPopulation": ".capped_population",
+    "MM1CappedSystem": ".capped_system",
+})
@@ -2,10 +2,12 @@
 M/M/1 Queue with Finite Population Model
 """
 
-import numpy as np
-from math import factorial as fact
+from ..backend import any_true, exp, numpy
+from ...instrumentation import instrumented
+from ..sensitivity import metric_sensitivities, metric_differences
 from enum import Enum
 
+@instrumented
 class MM1CappedPopulation:
     """
     Class to represent an M/M/1 FIFO queue with a finite population.
@@ -21,7 +23,7 @@ class MM1CappedPopulation:
         m (int): Population size.
         """
 
-        if lmbda >= mu:
+        if any_true(lmbda >= mu):
             raise ValueError("This system won't stop growing (lambda >= mu).")
 
         self.lmbda = lmbda
@@ -106,17 +108,26 @@ class MM1CappedPopulation:
         if t == 0:
             return self.probability_of_waiting()
         
-        return self.psi * np.exp(self.mu * t * (self.psi - 1))
+        return self.psi * exp(self.mu * t * (self.psi - 1))
     
     def probability_of_zero_units(self) -> float:
         """
         Calculate the probability of having zero units in the system.
 
+        The sum of m!/(m - k)! * psi**k is evaluated in Horner form,
+        1 + m*psi*(1 + (m - 1)*psi*(... (1 + psi))), so no factorial is
+        converted to float. Past the float range the sum is inf and P0 is
+        0.0, its value to double precision.
+
         Returns:
         float: Probability of having zero units in the system.
         """
 
-        return  (1 + sum(((fact(self.m)*(self.psi**k)) / (fact(self.m - k))) for k in range(1, self.m + 1)))**(-1)
+        total = 1
+        for n in range(1, self.m + 1):
+            total = 1 + n * self.psi * total
+
+        return 1 / total
 
     def _p_n_recursive(self, n: int):
         """
@@ -132,7 +143,11 @@ class MM1CappedPopulation:
         """
         Default function to calculate P_0.
         """
-        return self.probability_of_zero_units() * fact(self.m)*(self.psi**n) / (fact(self.m - n))
+        p = self.probability_of_zero_units()
+        for k in range(self.m - n + 1, self.m + 1):
+            p = p * k * self.psi
+
+        return p
 
     class PnStrategies(Enum):
         """
@@ -141,9 +156,10 @@ class MM1CappedPopulation:
         DEFAULT = 0
         RECURSIVE = 1
 
+    # Method names, looked up on the instance so instrumentation sees the calls.
     _p_n_strategies = {
-        PnStrategies.DEFAULT: _p_n_default,
-        PnStrategies.RECURSIVE: _p_n_recursive
+        PnStrategies.DEFAULT: "_p_n_default",
+        PnStrategies.RECURSIVE: "_p_n_recursive"
     }
     
     def probability_of_n_units(self, n: int, strategy: PnStrategies = PnStrategies.DEFAULT) -> float:
@@ -164,7 +180,26 @@ class MM1CappedPopulation:
         if n > self.m:
             raise ValueError("Number of units must be less than or equal to the population size.")
 
-        return self._p_n_strategies[strategy](self, n)
+        return getattr(self, self._p_n_strategies[strategy])(n)
+
+    def stationary_distribution(self) -> "numpy.ndarray":
+        """
+        Calculate the probabilities of having 0..m units in the system. The
+        products are accumulated in log space so large populations don't
+        overflow.
+
+        Returns:
+        ndarray: Probability of having n units in the system, for n = 0..m,
+        on the last axis when psi is an array.
+        """
+
+        np = numpy()
+        n = np.arange(self.m)
+        log_ratio = np.log(self.m - n) + np.log(np.asarray(self.psi))[..., None]
+        log_p = np.concatenate((np.zeros(log_ratio.shape[:-1] + (1,)), np.cumsum(log_ratio, axis=-1)), axis=-1)
+        p = np.exp(log_p - log_p.max(axis=-1, keepdims=True))
+
+        return p / p.sum(axis=-1, keepdims=True)
 
     def units_outside_system_mean(self) -> float:
         """
@@ -196,7 +231,24 @@ class MM1CappedPopulation:
 
         return 1 - self.probability_of_zero_units()
 
+    def metric_sensitivities(self) -> dict:
+        """
+        Calculate the partial derivatives of L, Lq, W and Wq with respect to
+        lambda and mu. Works element-wise when lambda or mu are arrays.
+
+        Returns:
+        dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+        """
 
+        return metric_sensitivities(MM1CappedPopulation, self.lmbda, self.mu, m=self.m)
 
+    def population_increment_differences(self) -> dict:
+        """
+        Calculate the change of L, Lq, W and Wq when the population size is
+        increased by one.
 
+        Returns:
+        dict: Metric name mapped to the difference (m -> m + 1).
+        """
 
+        return metric_differences(self, m=self.m + 1)
@@ -2,6 +2,11 @@
 M/M/1 Queue with Finite Capacity Model
 """
 
+from ..backend import any_true, numpy
+from ...instrumentation import instrumented
+from ..sensitivity import metric_sensitivities, metric_differences
+
+@instrumented
 class MM1CappedSystem:
     """
     Class to represent an M/M/1 queue with finite capacity.
@@ -17,7 +22,7 @@ class MM1CappedSystem:
         M (int): Capacity of the system.
         """
 
-        if lmbda >= mu:
+        if any_true(lmbda >= mu):
             raise ValueError("This system won't stop growing (lambda >= mu).")
 
         self.lmbda = lmbda
@@ -47,7 +52,7 @@ class MM1CappedSystem:
         float: Mean number of units in the queue.
         """
         
-        return (self.psi ** 2) / (1 - self.psi)
+        return self.system_units_amount_mean() - (1 - self.probability_of_zero_units())
 
     def unoccupied_servers_mean(self) -> float:
         """
@@ -57,7 +62,7 @@ class MM1CappedSystem:
         float: Mean number of unoccupied servers.
         """
         
-        return 1 - self.psi
+        return self.probability_of_zero_units()
     
     def time_in_queue_mean(self) -> float:
         """
@@ -67,7 +72,7 @@ class MM1CappedSystem:
         float: Mean time spent in the queue.
         """
 
-        return self.queue_units_amount_mean() / (self.lmbda * (self.probability_of_zero_units() + self.probability_of_n_units(1)))
+        return self.queue_units_amount_mean() / self.effective_arrival_rate()
     
     def time_in_system_mean(self) -> float:
         """
@@ -102,7 +107,7 @@ class MM1CappedSystem:
 
         term1 = 1 - self.psi
 
-        return term1 / (term1 **(self.M + 1))
+        return term1 / (1 - (self.psi ** (self.M + 1)))
     
     def probability_of_n_units(self, n: int) -> float:
         """
@@ -122,6 +127,20 @@ class MM1CappedSystem:
         if n >= 1:
             return self.probability_of_zero_units() * (self.psi ** n)
         
+    def stationary_distribution(self) -> "numpy.ndarray":
+        """
+        Calculate the probabilities of having 0..M units in the system.
+
+        Returns:
+        ndarray: Probability of having n units in the system, for n = 0..M,
+        on the last axis when lambda or mu are arrays.
+        """
+
+        np = numpy()
+        p0 = np.asarray(self.probability_of_zero_units())[..., None]
+
+        return p0 * (np.asarray(self.psi)[..., None] ** np.arange(self.M + 1))
+
     def effective_arrival_rate(self) -> float:
         """
         Calculate the effective arrival rate.
@@ -131,3 +150,25 @@ class MM1CappedSystem:
         """
 
         return self.lmbda * (1 - self.probability_of_n_units(self.M))
+
+    def metric_sensitivities(self) -> dict:
+        """
+        Calculate the partial derivatives of L, Lq, W and Wq with respect to
+        lambda and mu. Works element-wise when lambda or mu are arrays.
+
+        Returns:
+        dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+        """
+
+        return metric_sensitivities(MM1CappedSystem, self.lmbda, self.mu, M=self.M)
+
+    def capacity_increment_differences(self) -> dict:
+        """
+        Calculate the change of L, Lq, W and Wq when the system capacity is
+        increased by one.
+
+        Returns:
+        dict: Metric name mapped to the difference (M -> M + 1).
+        """
+
+        return metric_differences(self, M=self.M + 1)
@@ -3,8 +3,11 @@ M/M/1 Queue Model with Infinite Capacity and Population
 """
 
 
-import numpy as np
+from ..backend import any_true, exp
+from ...instrumentation import instrumented
+from ..sensitivity import metric_sensitivities
 
+@instrumented
 class MM1Uncapped:
     """
     Class to represent an M/M/1 queue with infinite capacity and population.
@@ -19,7 +22,7 @@ class MM1Uncapped:
         mu (float): Service rate (customers per time unit).
         """
 
-        if lmbda >= mu:
+        if any_true(lmbda >= mu):
             raise ValueError("This system won't stop growing (lambda >= mu).")
 
         self.lmbda = lmbda
@@ -101,7 +104,7 @@ class MM1Uncapped:
         if t < 0:
             raise ValueError("Time must be non-negative.")
 
-        return self.psi * np.exp(self.mu * t * (self.psi - 1))
+        return self.psi * exp(self.mu * t * (self.psi - 1))
     
     def probability_of_zero_units(self) -> float:
         """
@@ -130,3 +133,14 @@ class MM1Uncapped:
             return self.probability_of_zero_units()
         if n >= 1:
             return (self.psi ** n) * (1 - self.psi)
+
+    def metric_sensitivities(self) -> dict:
+        """
+        Calculate the partial derivatives of L, Lq, W and Wq with respect to
+        lambda and mu. Works element-wise when lambda or mu are arrays.
+
+        Returns:
+        dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+        """
+
+        return metric_sensitivities(MM1Uncapped, self.lmbda, self.mu)
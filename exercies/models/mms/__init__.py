@@ -1 +1,6 @@
-from .uncapped import MMSUncapped
\ No newline at end of file
+from ..._lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, {
+    "MMSUncapped": ".uncapped",
+    "MMSCappedPopulation": ".capped_population",
+})
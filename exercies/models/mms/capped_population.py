@@ -0,0 +1,241 @@
+"""
+M/M/s Queue with Finite Population Model
+"""
+
+import numpy as np
+from ...instrumentation import instrumented
+from ..sensitivity import metric_differences
+
+@instrumented
+class MMSCappedPopulation:
+    """
+    Class to represent an M/M/s FIFO queue with a finite population
+    (machine repair model with s crews).
+    """
+
+    def __init__(self, lmbda: float, mu: float, s: int, m: int):
+        """
+        Initialize the M/M/s queue.
+
+        Parameters:
+        lmbda (float): Arrival rate per unit outside the system.
+        mu (float): Service rate per server.
+        s (int): Number of servers.
+        m (int): Population size.
+        """
+
+        if s < 1:
+            raise ValueError("Number of servers must be at least one.")
+        if m < 1:
+            raise ValueError("Population size must be at least one.")
+
+        self.lmbda = lmbda
+        self.mu = mu
+        self.s = s
+        self.m = m
+        self.psi = lmbda / mu
+
+    def stationary_distribution(self) -> np.ndarray:
+        """
+        Calculate the probabilities of having 0..m units in the system. The
+        products are accumulated in log space so large populations don't
+        overflow.
+
+        Returns:
+        ndarray: Probability of having n units in the system, for n = 0..m,
+        on the last axis when lambda or mu are arrays.
+        """
+
+        n = np.arange(self.m)
+        log_ratio = np.log(self.m - n) + np.log(np.asarray(self.psi))[..., None] - np.log(np.minimum(n + 1, self.s))
+        log_p = np.concatenate((np.zeros(log_ratio.shape[:-1] + (1,)), np.cumsum(log_ratio, axis=-1)), axis=-1)
+        p = np.exp(log_p - log_p.max(axis=-1, keepdims=True))
+
+        return p / p.sum(axis=-1, keepdims=True)
+
+    def _mean(self, values: np.ndarray) -> float:
+        """
+        Expected value of a quantity given per state, element-wise when
+        lambda or mu are arrays.
+        """
+
+        return _scalar(self.stationary_distribution() @ values)
+
+    def system_units_amount_mean(self) -> float:
+        """
+        Calculate the mean number of units in the system.
+
+        Returns:
+        float: Mean number of units in the system.
+        """
+
+        return self._mean(np.arange(self.m + 1))
+
+    def queue_units_amount_mean(self) -> float:
+        """
+        Calculate the mean number of units in the queue. This are units
+        in the system but not being served.
+
+        Returns:
+        float: Mean number of units in the queue.
+        """
+
+        return self._mean(np.maximum(np.arange(self.m + 1) - self.s, 0))
+
+    def unoccupied_servers_mean(self) -> float:
+        """
+        Calculate the mean number of unoccupied servers.
+
+        Returns:
+        float: Mean number of unoccupied servers.
+        """
+
+        return self._mean(np.maximum(self.s - np.arange(self.m + 1), 0))
+
+    def units_outside_system_mean(self) -> float:
+        """
+        Calculate the mean number of units outside the system.
+
+        Returns:
+        float: Mean number of units outside the system.
+        """
+
+        return self.m - self.system_units_amount_mean()
+
+    def arrival_rate_mean(self) -> float:
+        """
+        Calculate the mean arrival rate.
+
+        Returns:
+        float: Mean arrival rate.
+        """
+
+        return self.lmbda * self.units_outside_system_mean()
+
+    def time_in_queue_mean(self) -> float:
+        """
+        Calculate the mean time spent in the queue.
+
+        Returns:
+        float: Mean time spent in the queue.
+        """
+
+        return self.queue_units_amount_mean() / self.arrival_rate_mean()
+
+    def time_in_system_mean(self) -> float:
+        """
+        Calculate the mean time spent in the system.
+
+        Returns:
+        float: Mean time spent in the system.
+        """
+
+        return self.system_units_amount_mean() / self.arrival_rate_mean()
+
+    def time_of_service_mean(self) -> float:
+        """
+        Calculate the mean time spent in service.
+
+        Returns:
+        float: Mean time spent in service.
+        """
+
+        return 1 / self.mu
+
+    def probability_of_zero_units(self) -> float:
+        """
+        Calculate the probability of having zero units in the system.
+
+        Returns:
+        float: Probability of having zero units in the system.
+        """
+
+        return _scalar(self.stationary_distribution()[..., 0])
+
+    def probability_of_n_units(self, n: int) -> float:
+        """
+        Calculate the probability of having n units in the system.
+
+        Parameters:
+        n (int): Number of units.
+
+        Returns:
+        float: Probability of having n units in the system.
+        """
+
+        if n < 0:
+            raise ValueError("Number of units must be non-negative.")
+        if n > self.m:
+            raise ValueError("Number of units must be less than or equal to the population size.")
+
+        return _scalar(self.stationary_distribution()[..., n])
+
+    def metric_sensitivities(self) -> dict:
+        """
+        Calculate the partial derivatives of L, Lq, W and Wq with respect to
+        lambda and mu. Works element-wise when lambda or mu are arrays.
+
+        The stationary distribution can't carry dual numbers through np.log,
+        so the derivatives are closed forms: P(n) is proportional to
+        (lambda / mu)**n, hence dP(n)/dlambda = P(n) * (n - L) / lambda and
+        the derivatives of L and Lq are covariances with n. With arrays they
+        are computed at once over the stationary matrix, one row per scenario.
+
+        Returns:
+        dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+        """
+
+        p = self.stationary_distribution()
+        n = np.arange(self.m + 1)
+        waiting = np.maximum(n - self.s, 0)
+        L = p @ n
+        Lq = p @ waiting
+
+        # Derivatives of log(P(n)) are n / lambda and -n / mu.
+        deviation = n - L[..., None]
+        cov_L = (p * deviation) @ n
+        cov_Lq = (p * deviation) @ waiting
+        d_L = (cov_L / self.lmbda, -cov_L / self.mu)
+        d_Lq = (cov_Lq / self.lmbda, -cov_Lq / self.mu)
+
+        rate = self.lmbda * (self.m - L)
+        d_rate = ((self.m - L) - self.lmbda * d_L[0], -self.lmbda * d_L[1])
+
+        def per_arrival(x, d_x):
+            return tuple(_scalar((d_x[i] * rate - x * d_rate[i]) / rate**2) for i in range(2))
+
+        return {
+            "L": tuple(map(_scalar, d_L)),
+            "Lq": tuple(map(_scalar, d_Lq)),
+            "W": per_arrival(L, d_L),
+            "Wq": per_arrival(Lq, d_Lq),
+        }
+
+    def servers_increment_differences(self) -> dict:
+        """
+        Calculate the change of L, Lq, W and Wq when the number of servers is
+        increased by one.
+
+        Returns:
+        dict: Metric name mapped to the difference (s -> s + 1).
+        """
+
+        return metric_differences(self, s=self.s + 1, m=self.m)
+
+    def population_increment_differences(self) -> dict:
+        """
+        Calculate the change of L, Lq, W and Wq when the population size is
+        increased by one.
+
+        Returns:
+        dict: Metric name mapped to the difference (m -> m + 1).
+        """
+
+        return metric_differences(self, s=self.s, m=self.m + 1)
+
+def _scalar(value):
+    """
+    Unwrap zero-dimensional results to float, keep arrays as they are.
+    """
+
+    return float(value) if np.ndim(value) == 0 else value
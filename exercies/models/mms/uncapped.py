@@ -2,9 +2,11 @@
 M/M/s Queue Model with Infinite Capacity and Population
 """
 
-import numpy as np
-from math import factorial as fact
+from ..backend import any_true, exp
+from ...instrumentation import instrumented
+from ..sensitivity import metric_sensitivities, metric_differences
 
+@instrumented
 class MMSUncapped:
     """
     Class to represent an M/M/s queue with infinite capacity and population.
@@ -20,7 +22,7 @@ class MMSUncapped:
         s (int): Number of servers.
         """
 
-        if lmbda >= s * mu:
+        if any_true(lmbda >= s * mu):
             raise ValueError("This system won't stop growing (lambda >= s * mu).")
 
         self.lmbda = lmbda
@@ -36,11 +38,7 @@ class MMSUncapped:
         float: Mean number of units in the system.
         """
 
-        div1 = self.psi**(self.s + 1)
-        div2 = (self.s * fact(self.s) * ((1 - (self.psi/self.s))**2))
-        
-
-        return (div1/div2) * self.probability_of_zero_units() + self.psi
+        return self.queue_units_amount_mean() + self.psi
     
     def queue_units_amount_mean(self) -> float:
         """
@@ -51,7 +49,9 @@ class MMSUncapped:
         float: Mean number of units in the queue.
         """
 
-        return 1 * (self.psi ** (self.s+1)) / (self.s*fact(self.s)*((1-(self.psi/self.s))**2)*self.mu)
+        rho = self.psi / self.s
+
+        return self.probability_of_units_in_system_geq_servers_amount() * rho / (1 - rho)
     
     def unoccupied_servers_mean(self) -> float:
         """
@@ -104,21 +104,26 @@ class MMSUncapped:
         float: Probability of waiting over the time threshold.
         """
 
-        return self.probability_of_units_in_system_geq_servers_amount() * np.exp(self.mu * t * ((self.psi/self.s)-1))
+        return self.probability_of_units_in_system_geq_servers_amount() * exp(self.mu * t * ((self.psi/self.s)-1))
     
     def probability_of_zero_units(self) -> float:
         """
-        Calculate the probability of having zero units in the system.
+        Calculate the probability of having zero units in the system. The
+        terms psi**x / x! are built as running products so no factorial is
+        converted to float.
 
         Returns:
         float: Probability of having zero units in the system.
         """
-        
-        sum1 = sum(map(lambda x: ((self.psi**self.s)/fact(x)), range(self.s)))
-        sum2 = (self.psi**self.s)/(fact(self.s)* (1-((self.psi/self.s)**2)))
 
+        term = 1
+        total = 1
+        for x in range(1, self.s):
+            term = term * self.psi / x
+            total = total + term
+        term = term * self.psi / self.s
 
-        return (sum1 + sum2) ** -1
+        return 1 / (total + term / (1 - (self.psi/self.s)))
     
     def probability_of_n_units(self, n: int) -> float:
         """
@@ -132,22 +137,31 @@ class MMSUncapped:
         """
 
         if n < self.s:
-            return ((self.psi**n) / fact(n)) * self.probability_of_zero_units()
+            p = self.probability_of_zero_units()
+            for x in range(1, n + 1):
+                p = p * self.psi / x
+            return p
         else:
-            return ((self.psi**n) / (fact(self.s) * (self.s**(n-self.s)))) * self.probability_of_zero_units()
+            rho = self.psi / self.s
+            return self.probability_of_units_in_system_geq_servers_amount() * (1 - rho) * rho**(n - self.s)
         
     def probability_of_units_in_system_geq_servers_amount(self) -> float:
         """
         Calculate the probability of having an amount of units in the system greater than or equal to the number of servers.
 
-        Parameters:
-        n (int): Number of units.
+        This is Erlang's C formula, obtained from the Erlang B recursion
+        B(k) = psi*B(k-1) / (k + psi*B(k-1)), whose values stay in [0, 1]
+        for any number of servers.
 
         Returns:
         float: Probability of having an amount of units in the system greater than or equal to the number of servers.
         """
 
-        return self.probability_of_zero_units() * (self.psi**self.s) / (fact(self.s) * (1 - (self.psi/self.s)))
+        blocking = 1
+        for k in range(1, self.s + 1):
+            blocking = self.psi * blocking / (k + self.psi * blocking)
+
+        return blocking / (1 - (self.psi/self.s) * (1 - blocking))
     
     def effective_service_rate(self, n: int) -> float:
         """
@@ -166,3 +180,25 @@ class MMSUncapped:
             return self.mu * n
         else:
             return self.mu * self.s
+
+    def metric_sensitivities(self) -> dict:
+        """
+        Calculate the partial derivatives of L, Lq, W and Wq with respect to
+        lambda and mu. Works element-wise when lambda or mu are arrays.
+
+        Returns:
+        dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+        """
+
+        return metric_sensitivities(MMSUncapped, self.lmbda, self.mu, s=self.s)
+
+    def servers_increment_differences(self) -> dict:
+        """
+        Calculate the change of L, Lq, W and Wq when the number of servers is
+        increased by one.
+
+        Returns:
+        dict: Metric name mapped to the difference (s -> s + 1).
+        """
+
+        return metric_differences(self, s=self.s + 1)
@@ -0,0 +1,131 @@
+"""
+Forward-mode sensitivities of the queue models with respect to lambda and mu
+"""
+
+METRICS = {
+    "L": "system_units_amount_mean",
+    "Lq": "queue_units_amount_mean",
+    "W": "time_in_system_mean",
+    "Wq": "time_in_queue_mean",
+}
+
+class Dual:
+    """
+    Class to represent a dual number carrying its partial derivatives with
+    respect to lambda and mu. Values may be scalars or NumPy arrays.
+    """
+
+    def __init__(self, value, d_lmbda=0.0, d_mu=0.0):
+        """
+        Initialize the dual number.
+
+        Parameters:
+        value (float | ndarray): Value of the number.
+        d_lmbda (float | ndarray): Partial derivative with respect to lambda.
+        d_mu (float | ndarray): Partial derivative with respect to mu.
+        """
+
+        self.value = value
+        self.d_lmbda = d_lmbda
+        self.d_mu = d_mu
+
+    @staticmethod
+    def _lift(other) -> "Dual":
+        return other if isinstance(other, Dual) else Dual(other)
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.value, -self.d_lmbda, -self.d_mu)
+
+    def __add__(self, other) -> "Dual":
+        other = Dual._lift(other)
+        return Dual(self.value + other.value, self.d_lmbda + other.d_lmbda, self.d_mu + other.d_mu)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> "Dual":
+        return self + (-Dual._lift(other))
+
+    def __rsub__(self, other) -> "Dual":
+        return Dual._lift(other) + (-self)
+
+    def __mul__(self, other) -> "Dual":
+        other = Dual._lift(other)
+        return Dual(
+            self.value * other.value,
+            self.d_lmbda * other.value + self.value * other.d_lmbda,
+            self.d_mu * other.value + self.value * other.d_mu,
+        )
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> "Dual":
+        other = Dual._lift(other)
+        value = self.value / other.value
+        return Dual(
+            value,
+            (self.d_lmbda - value * other.d_lmbda) / other.value,
+            (self.d_mu - value * other.d_mu) / other.value,
+        )
+
+    def __rtruediv__(self, other) -> "Dual":
+        return Dual._lift(other) / self
+
+    def __pow__(self, n: float) -> "Dual":
+        if n == 0:
+            return Dual(self.value ** 0)
+        scale = n * self.value ** (n - 1)
+        return Dual(self.value ** n, scale * self.d_lmbda, scale * self.d_mu)
+
+    def __lt__(self, other):
+        return self.value < Dual._lift(other).value
+
+    def __le__(self, other):
+        return self.value <= Dual._lift(other).value
+
+    def __gt__(self, other):
+        return self.value > Dual._lift(other).value
+
+    def __ge__(self, other):
+        return self.value >= Dual._lift(other).value
+
+def metric_sensitivities(model_class, lmbda, mu, **params) -> dict:
+    """
+    Calculate the partial derivatives of L, Lq, W and Wq with respect to
+    lambda and mu by propagating dual numbers through the model formulas.
+
+    Parameters:
+    model_class (type): Queue model class.
+    lmbda (float | ndarray): Arrival rate.
+    mu (float | ndarray): Service rate.
+    params: Remaining (integer) parameters of the model.
+
+    Returns:
+    dict: Metric name mapped to a (d/dlambda, d/dmu) tuple.
+    """
+
+    model = model_class(Dual(lmbda, 1.0, 0.0), Dual(mu, 0.0, 1.0), **params)
+    result = {}
+
+    for name, method in METRICS.items():
+        value = getattr(model, method)()
+        # Broadcast the partials to the shape of the value.
+        result[name] = (value.d_lmbda + 0 * value.value, value.d_mu + 0 * value.value)
+
+    return result
+
+def metric_differences(model, **params) -> dict:
+    """
+    Calculate the forward differences of L, Lq, W and Wq when an integer
+    parameter of the model is replaced.
+
+    Parameters:
+    model: Queue model instance.
+    params: Integer parameters of the perturbed model (e.g. s=model.s + 1).
+
+    Returns:
+    dict: Metric name mapped to the difference (perturbed - original).
+    """
+
+    other = type(model)(model.lmbda, model.mu, **params)
+
+    return {name: getattr(other, method)() - getattr(model, method)() for name, method in METRICS.items()}
@@ -0,0 +1,206 @@
+"""
+Cost optimization of crews and repair speed for the machine repair model
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from .instrumentation import instrumented, record_cache
+
+# Log-probability below the mode from which the tails are discarded.
+TAIL_LOG_RATIO = -40.0
+
+class RepairPlan(NamedTuple):
+    """
+    Staffing decision for the machine repair model and its cost per time unit.
+    """
+    crews: int
+    mu: float
+    cost: float
+
+@instrumented
+class RepairCostOptimizer:
+    """
+    Class to search the number of crews and the repair speed of an M/M/s
+    FIFO/-/m machine repair model that minimize the cost per time unit:
+
+    cost = downtime_cost * L + crews * (crew_cost + speed_cost * mu)
+    """
+
+    def __init__(self, lmbda: float, m: int, downtime_cost: float, crew_cost: float, speed_cost: float = 0.0):
+        """
+        Initialize the optimizer.
+
+        Parameters:
+        lmbda (float): Breakdown rate per working machine.
+        m (int): Fleet size.
+        downtime_cost (float): Cost per broken machine per time unit.
+        crew_cost (float): Cost per crew per time unit.
+        speed_cost (float): Cost per unit of mu per crew per time unit.
+        """
+
+        if m < 1:
+            raise ValueError("Fleet size must be at least one.")
+
+        self.lmbda = lmbda
+        self.m = m
+        self.downtime_cost = downtime_cost
+        self.crew_cost = crew_cost
+        self.speed_cost = speed_cost
+
+        # Terms of the stationary distribution that don't depend on (s, mu),
+        # shared by every configuration evaluated.
+        n = np.arange(m)
+        self._n = np.arange(m + 1)
+        self._log_remaining = np.log(m - n) + np.log(lmbda)
+        self._log_next = np.log(n + 1)
+        self._costs = {}
+
+    def system_units_amount_mean(self, s: int, mu: float) -> float:
+        """
+        Calculate the mean number of broken machines with s crews repairing
+        at rate mu. Same result as MMSCappedPopulation(lmbda, mu, s, m).
+
+        Parameters:
+        s (int): Number of crews.
+        mu (float): Repair rate per crew.
+
+        Returns:
+        float: Mean number of broken machines.
+        """
+
+        log_s = np.log(s)
+        mode = self._mode(s, mu)
+        width = 64 + 8 * int(np.sqrt(self.m))
+
+        # The log-probabilities are concave in n, so once both ends of the
+        # window are TAIL_LOG_RATIO below the mode the mass outside is negligible.
+        while True:
+            lo, hi = max(mode - width, 0), min(mode + width, self.m)
+            log_ratio = self._log_remaining[lo:hi] - np.log(mu) - np.minimum(self._log_next[lo:hi], log_s)
+            log_p = np.concatenate(([0.0], np.cumsum(log_ratio)))
+            log_p -= log_p.max()
+            if (lo == 0 or log_p[0] < TAIL_LOG_RATIO) and (hi == self.m or log_p[-1] < TAIL_LOG_RATIO):
+                break
+            width *= 2
+
+        p = np.exp(log_p)
+
+        return float(self._n[lo:hi + 1] @ p / p.sum())
+
+    def _mode(self, s: int, mu: float) -> int:
+        """
+        Most likely number of broken machines: the first n whose ratio
+        P(n + 1) / P(n) = (m - n) * psi / min(n + 1, s) drops to one or below.
+        """
+
+        psi = self.lmbda / mu
+        mode = int(np.ceil((self.m * psi - 1) / (1 + psi)))
+        if mode >= s:
+            mode = max(s, int(np.ceil(self.m - s / psi)))
+
+        return min(max(mode, 0), self.m)
+
+    def cost(self, s: int, mu: float) -> float:
+        """
+        Calculate the cost per time unit of a configuration. Results are
+        memoized so neighboring searches don't evaluate a point twice.
+
+        Parameters:
+        s (int): Number of crews.
+        mu (float): Repair rate per crew.
+
+        Returns:
+        float: Cost per time unit.
+        """
+
+        key = (s, mu)
+        record_cache("RepairCostOptimizer.cost", key in self._costs)
+        if key not in self._costs:
+            staffing = s * (self.crew_cost + self.speed_cost * mu)
+            self._costs[key] = self.downtime_cost * self.system_units_amount_mean(s, mu) + staffing
+
+        return self._costs[key]
+
+    def optimal_crews(self, mu: float, start: int = 1) -> RepairPlan:
+        """
+        Find the cost-optimal number of crews for a repair speed. The cost is
+        convex in the number of crews, so the search gallops from start
+        towards the sign change of the forward difference and bisects it,
+        needing O(log m) evaluations.
+
+        Parameters:
+        mu (float): Repair rate per crew.
+        start (int): Initial guess, e.g. the optimum of a neighboring speed.
+
+        Returns:
+        RepairPlan: Optimal number of crews and its cost.
+        """
+
+        if mu <= 0:
+            raise ValueError("Repair rate must be positive.")
+
+        def rising(s: int) -> bool:
+            return s >= self.m or self.cost(s + 1, mu) >= self.cost(s, mu)
+
+        s = min(max(start, 1), self.m)
+
+        # Bracket the optimum in (lo, hi] with rising(hi) and not rising(lo).
+        step = 1
+        if rising(s):
+            hi, lo = s, s - step
+            while lo >= 1 and rising(lo):
+                hi, step = lo, step * 2
+                lo = hi - step
+            lo = max(lo, 0)
+        else:
+            lo, hi = s, s + step
+            while hi < self.m and not rising(hi):
+                lo, step = hi, step * 2
+                hi = lo + step
+            hi = min(hi, self.m)
+
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if rising(mid):
+                hi = mid
+            else:
+                lo = mid
+
+        return RepairPlan(hi, mu, self.cost(hi, mu))
+
+    def frontier(self, mus) -> list[RepairPlan]:
+        """
+        Calculate the cost-optimal number of crews for each repair speed.
+        Speeds are visited in increasing order and each search is warm
+        started from the optimum of the previous speed.
+
+        Parameters:
+        mus (iterable of float): Candidate repair rates per crew.
+
+        Returns:
+        list[RepairPlan]: Optimal plan per repair speed, ordered by speed.
+        """
+
+        plans = []
+        start = 1
+
+        for mu in sorted(set(float(mu) for mu in mus)):
+            plan = self.optimal_crews(mu, start)
+            plans.append(plan)
+            start = plan.crews
+
+        return plans
+
+    def optimize(self, mus) -> RepairPlan:
+        """
+        Find the cost-optimal number of crews and repair speed.
+
+        Parameters:
+        mus (iterable of float): Candidate repair rates per crew.
+
+        Returns:
+        RepairPlan: Cheapest plan.
+        """
+
+        return min(self.frontier(mus), key=lambda plan: plan.cost)
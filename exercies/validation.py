@@ -0,0 +1,329 @@
+"""
+Cross-validation of the closed-form models against numeric solutions
+
+Random stable configurations of every model are evaluated three ways:
+
+- Closed form: the model methods.
+- Numeric: the stationary distribution of the (truncated) birth-death
+  generator matrix, solved with NumPy.
+- Simulation: a Gillespie simulation of the same chain, for a subset.
+
+The work is split in chunks over a process pool and stops submitting new
+chunks once the wall-clock budget is spent.
+
+Usage:
+
+    python -m exercies.validation --samples 5000 --budget 60
+"""
+
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from .models import MM1Uncapped, MM1CappedPopulation, MM1CappedSystem, MMSUncapped, MMSCappedPopulation
+from .models.sensitivity import METRICS
+
+FIELDS = (*METRICS, "P0")
+
+# Upper edges of the load regions the report is split by.
+LOAD_REGIONS = (0.5, 0.8, 0.9, 1.0, math.inf)
+
+# Tail probability left out when truncating infinite models.
+TRUNCATION_TAIL = 1e-14
+
+# Largest population, capacity or number of servers sampled. Well past 170,
+# the largest n whose n! fits in a float, so formulas converting factorials
+# to float are caught.
+MAX_UNITS = 400
+
+# Values below this fraction of their scale are compared absolutely, the
+# numeric solutions carry round-off of that order for quantities close to
+# zero. Queue lengths and waits are scaled by the system ones (L, W), since
+# the round-off of the numeric solution grows with them.
+ERROR_FLOOR = 1e-6
+
+def _sample_mm1_uncapped(rng: random.Random) -> dict:
+    mu = rng.uniform(0.5, 20)
+    return {"lmbda": rng.uniform(0.01, 0.95) * mu, "mu": mu}
+
+def _sample_mm1_capped_system(rng: random.Random) -> dict:
+    return {**_sample_mm1_uncapped(rng), "M": rng.randint(1, MAX_UNITS)}
+
+def _sample_mm1_capped_population(rng: random.Random) -> dict:
+    return {**_sample_mm1_uncapped(rng), "m": rng.randint(1, MAX_UNITS)}
+
+def _sample_mms_uncapped(rng: random.Random) -> dict:
+    mu, s = rng.uniform(0.5, 20), rng.randint(1, MAX_UNITS)
+    return {"lmbda": rng.uniform(0.01, 0.95) * s * mu, "mu": mu, "s": s}
+
+def _sample_mms_capped_population(rng: random.Random) -> dict:
+    mu, m = rng.uniform(0.5, 20), rng.randint(1, MAX_UNITS)
+    return {"lmbda": rng.uniform(0.001, 2) * mu, "mu": mu, "s": rng.randint(1, m), "m": m}
+
+def _birth_death(name: str, params: dict):
+    """
+    Describe a model as a birth-death chain.
+
+    Returns:
+    tuple: (birth rates, death rates, number of servers, load), rates as arrays over the states.
+    """
+
+    lmbda, mu = params["lmbda"], params["mu"]
+    s = params.get("s", 1)
+
+    if name in ("MM1CappedPopulation", "MMSCappedPopulation"):
+        m = params["m"]
+        n = np.arange(m + 1)
+        return (m - n) * lmbda, np.minimum(n, s) * mu, s, m * lmbda / (s * mu)
+
+    if name == "MM1CappedSystem":
+        n = np.arange(params["M"] + 1)
+        return np.where(n < params["M"], lmbda, 0.0), np.minimum(n, 1) * mu, 1, lmbda / mu
+
+    rho = lmbda / (s * mu)
+    n = np.arange(s + int(math.log(TRUNCATION_TAIL) / math.log(rho)) + 1)
+    return np.where(n < n[-1], lmbda, 0.0), np.minimum(n, s) * mu, s, rho
+
+MODELS = {
+    "MM1Uncapped": (MM1Uncapped, _sample_mm1_uncapped),
+    "MM1CappedSystem": (MM1CappedSystem, _sample_mm1_capped_system),
+    "MM1CappedPopulation": (MM1CappedPopulation, _sample_mm1_capped_population),
+    "MMSUncapped": (MMSUncapped, _sample_mms_uncapped),
+    "MMSCappedPopulation": (MMSCappedPopulation, _sample_mms_capped_population),
+}
+
+def _metrics(p: np.ndarray, arrival_rate: float, s: int) -> dict:
+    n = np.arange(len(p))
+    L = float(n @ p)
+    Lq = float(np.maximum(n - s, 0) @ p)
+
+    return {"L": L, "Lq": Lq, "W": L / arrival_rate, "Wq": Lq / arrival_rate, "P0": float(p[0])}
+
+def analytic_metrics(name: str, params: dict) -> dict:
+    """
+    Calculate the metrics with the closed-form model.
+
+    Parameters:
+    name (str): Model name, key of MODELS.
+    params (dict): Model parameters.
+
+    Returns:
+    dict: Metric name mapped to its value.
+    """
+
+    model = MODELS[name][0](**params)
+    result = {field: float(getattr(model, method)()) for field, method in METRICS.items()}
+    result["P0"] = float(model.probability_of_zero_units())
+
+    return result
+
+def numeric_metrics(name: str, params: dict) -> dict:
+    """
+    Calculate the metrics from the stationary distribution of the generator
+    matrix Q, solving pi Q = 0 with sum(pi) = 1.
+
+    Parameters:
+    name (str): Model name, key of MODELS.
+    params (dict): Model parameters.
+
+    Returns:
+    dict: Metric name mapped to its value.
+    """
+
+    birth, death, s, _ = _birth_death(name, params)
+    size = len(birth)
+
+    Q = np.diag(birth[:-1], 1) + np.diag(death[1:], -1)
+    Q -= np.diag(Q.sum(axis=1))
+
+    A = Q.T.copy()
+    A[-1] = 1.0
+    b = np.zeros(size)
+    b[-1] = 1.0
+
+    p = np.linalg.solve(A, b)
+
+    return _metrics(p, float(birth @ p), s)
+
+def simulated_metrics(name: str, params: dict, events: int, seed: int) -> dict:
+    """
+    Estimate the metrics with a Gillespie simulation of the chain. The first
+    tenth of the events is discarded as warm-up.
+
+    Parameters:
+    name (str): Model name, key of MODELS.
+    params (dict): Model parameters.
+    events (int): Number of simulated transitions.
+    seed (int): Random seed.
+
+    Returns:
+    dict: Metric name mapped to its estimate.
+    """
+
+    birth, death, s, _ = _birth_death(name, params)
+    birth, death = birth.tolist(), death.tolist()
+    rng = random.Random(seed)
+    time_in_state = [0.0] * len(birth)
+    arrivals = 0
+    n = 0
+
+    for event in range(events):
+        rate = birth[n] + death[n]
+        dt = rng.expovariate(rate)
+        arrive = rng.random() * rate < birth[n]
+        if event >= events // 10:
+            time_in_state[n] += dt
+            arrivals += arrive
+        n += 1 if arrive else -1
+
+    total = sum(time_in_state)
+
+    return _metrics(np.array(time_in_state) / total, arrivals / total, s)
+
+def _region(load: float) -> str:
+    lower = 0.0
+    for upper in LOAD_REGIONS:
+        if load < upper:
+            return f"[{lower:g}, {upper:g})"
+        lower = upper
+
+def _relative_errors(values: dict, reference: dict) -> dict:
+    scales = {"L": reference["L"], "Lq": reference["L"], "W": reference["W"], "Wq": reference["W"], "P0": 1.0}
+
+    return {
+        field: abs(values[field] - reference[field]) / max(abs(reference[field]), ERROR_FLOOR * max(abs(scales[field]), 1.0))
+        for field in FIELDS
+    }
+
+def _validate_chunk(tasks: list, deadline: float, events: int) -> list:
+    records = []
+
+    for name, params, simulate, seed in tasks:
+        if time.time() > deadline:
+            break
+
+        record = {"model": name, "region": _region(_birth_death(name, params)[3]), "params": params}
+        try:
+            analytic = analytic_metrics(name, params)
+            numeric = numeric_metrics(name, params)
+            record["numeric"] = _relative_errors(analytic, numeric)
+            if simulate:
+                simulated = simulated_metrics(name, params, events, seed)
+                record["simulation"] = _relative_errors(simulated, numeric)
+        except (ArithmeticError, ValueError, np.linalg.LinAlgError) as error:
+            record["error"] = repr(error)
+        records.append(record)
+
+    return records
+
+def run_validation(samples: int = 1000, budget: float = 60.0, simulate_fraction: float = 0.02,
+                   events: int = 200_000, workers: int | None = None, chunk: int = 50, seed: int = 0) -> list:
+    """
+    Validate every model on random stable configurations.
+
+    Parameters:
+    samples (int): Configurations per model.
+    budget (float): Wall-clock budget in seconds.
+    simulate_fraction (float): Fraction of configurations also simulated.
+    events (int): Simulated transitions per configuration.
+    workers (int | None): Processes in the pool, 0 to run in this process.
+    chunk (int): Configurations per pool task.
+    seed (int): Random seed.
+
+    Returns:
+    list: One record per evaluated configuration.
+    """
+
+    deadline = time.time() + budget
+    rng = random.Random(seed)
+    tasks = [
+        (name, sampler(rng), rng.random() < simulate_fraction, rng.randrange(2**32))
+        for name, (_, sampler) in MODELS.items()
+        for _ in range(samples)
+    ]
+    # Interleave models so a budget cut still covers all of them.
+    rng.shuffle(tasks)
+    chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
+
+    if workers == 0:
+        return [record for part in chunks for record in _validate_chunk(part, deadline, events)]
+
+    records = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_validate_chunk, part, deadline, events) for part in chunks}
+        while pending:
+            done, pending = wait(pending, timeout=max(deadline - time.time(), 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                records.extend(future.result())
+            if time.time() > deadline:
+                for future in pending:
+                    future.cancel()
+                break
+
+    return records
+
+def summarize(records: list) -> dict:
+    """
+    Aggregate the relative errors per model, comparison, region and metric.
+
+    Parameters:
+    records (list): Records returned by run_validation.
+
+    Returns:
+    dict: (model, comparison, region) mapped to {metric: (count, mean error, max error)}.
+    """
+
+    errors = {}
+    for record in records:
+        for comparison in ("numeric", "simulation"):
+            for field, error in record.get(comparison, {}).items():
+                key = (record["model"], comparison, record["region"])
+                errors.setdefault(key, {}).setdefault(field, []).append(error)
+
+    return {
+        key: {field: (len(values), float(np.mean(values)), float(np.max(values))) for field, values in fields.items()}
+        for key, fields in sorted(errors.items())
+    }
+
+def format_report(records: list) -> str:
+    """
+    Format the relative errors as a text table.
+
+    Parameters:
+    records (list): Records returned by run_validation.
+
+    Returns:
+    str: Report.
+    """
+
+    lines = [f"{'model':<20} {'comparison':<11} {'load':<12} {'n':>6}  " + "  ".join(f"{field + ' max':>10}" for field in FIELDS)]
+    for (model, comparison, region), fields in summarize(records).items():
+        count = max(values[0] for values in fields.values())
+        errors = "  ".join(f"{fields[field][2]:>10.2e}" for field in FIELDS)
+        lines.append(f"{model:<20} {comparison:<11} {region:<12} {count:>6}  {errors}")
+
+    failed = [record for record in records if "error" in record]
+    if failed:
+        lines.append(f"\n{len(failed)} configurations raised errors, e.g. {failed[0]['model']} {failed[0]['params']}: {failed[0]['error']}")
+
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validate the queue models.")
+    parser.add_argument("--samples", type=int, default=1000, help="configurations per model")
+    parser.add_argument("--budget", type=float, default=60.0, help="wall-clock budget in seconds")
+    parser.add_argument("--simulate-fraction", type=float, default=0.02, help="fraction also simulated")
+    parser.add_argument("--events", type=int, default=200_000, help="simulated transitions per configuration")
+    parser.add_argument("--workers", type=int, default=None, help="pool processes, 0 to run inline")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    records = run_validation(args.samples, args.budget, args.simulate_fraction, args.events, args.workers, seed=args.seed)
+    print(format_report(records))
+
+if __name__ == "__main__":
+    main()
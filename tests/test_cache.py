@@ -0,0 +1,120 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+from exercies.cache import ResultCache, _source_modules, model_key, model_keys
+from exercies.instrumentation import instrument
+from exercies.models.mm1 import MM1Uncapped, MM1CappedPopulation, MM1CappedSystem
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite")
+        self.cache = ResultCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_model_key(self):
+        self.assertEqual(model_key(MM1Uncapped(2, 3)), model_key(MM1Uncapped(2.0, 3.0)))
+        self.assertNotEqual(model_key(MM1Uncapped(2, 3)), model_key(MM1Uncapped(2, 4)))
+
+    def _load(self, name, source):
+        path = os.path.join(self.directory.name, f"{name}.py")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(source)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        self.addCleanup(sys.modules.pop, name, None)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_model_key_changes_with_model_source(self):
+        base = "from exercies.models import MM1Uncapped\n\nclass Model(MM1Uncapped):\n    pass\n"
+        edited = base + "\n    def time_in_system_mean(self):\n        return 0.0\n"
+        a1 = model_key(self._load("edited_model", base).Model(2.0, 3.0))
+        a2 = model_key(self._load("edited_model", edited).Model(2.0, 3.0))
+        self.assertNotEqual(a1, a2)
+
+    def test_model_key_changes_with_base_class_source(self):
+        base = "from exercies.models import MM1Uncapped\n\nclass Base(MM1Uncapped):\n    pass\n"
+        edited = base + "\n    def time_in_system_mean(self):\n        return 0.0\n"
+        subclass = "from edited_base import Base\n\nclass Model(Base):\n    pass\n"
+        self._load("edited_base", base)
+        a1 = model_key(self._load("edited_model", subclass).Model(2.0, 3.0))
+        self._load("edited_base", edited)
+        a2 = model_key(self._load("edited_model", subclass).Model(2.0, 3.0))
+        self.assertNotEqual(a1, a2)
+
+    def test_model_key_covers_shared_helpers(self):
+        a1 = set(_source_modules(MM1Uncapped))
+        a2 = {"exercies.models.mm1.uncapped", "exercies.models.backend", "exercies.models.sensitivity"}
+        self.assertLessEqual(a2, a1)
+
+    def test_evaluate_persists_across_connections(self):
+        queue = MM1CappedPopulation(2.0, 12.0, 5)
+        self.cache.evaluate(queue)
+
+        with ResultCache(self.path) as other:
+            a1 = other.get_many([model_key(queue)])[model_key(queue)]
+        self.assertAlmostEqual(a1["L"], queue.system_units_amount_mean(), delta=1e-12)
+        self.assertAlmostEqual(a1["stationary"][1], queue.probability_of_n_units(1), delta=1e-12)
+
+    def test_evaluate_many(self):
+        queues = [MM1Uncapped(lmbda, 10.0) for lmbda in (1.0, 2.0, 1.0, 3.0)]
+        a1 = [result["W"] for result in self.cache.evaluate_many(queues)]
+        a2 = [queue.time_in_system_mean() for queue in queues]
+        self.assertEqual(a1, a2)
+        self.assertEqual(len(self.cache.get_many([model_key(queue) for queue in queues])), 3)
+
+    def test_evaluate_array(self):
+        queue = MM1CappedPopulation(np.array([[1.0, 2.0], [3.0, 1.0]]), 12.0, 5)
+        result = self.cache.evaluate_array(queue)
+
+        np.testing.assert_allclose(result["L"], queue.system_units_amount_mean())
+        self.assertEqual(result["stationary"].shape, (2, 2, 6))
+        self.assertEqual(self.cache.evaluate(MM1CappedPopulation(2.0, 12.0, 5))["L"], result["L"][0, 1])
+        self.assertEqual(model_keys(queue)[1], model_key(MM1CappedPopulation(2.0, 12.0, 5)))
+
+    def test_evaluate_array_batches_misses(self):
+        lmbdas = np.array([1.0, 2.0, 3.0, 4.0])
+        queue = MM1CappedPopulation(lmbdas, 12.0, np.array([5, 6, 5, 6]))
+        with instrument() as recorder:
+            result = self.cache.evaluate_array(queue)
+
+        # One array-built model per population size.
+        self.assertEqual(recorder.snapshot()["MM1CappedPopulation.system_units_amount_mean"]["calls"], 2)
+        for lmbda, m, L, stationary in zip(lmbdas, (5, 6, 5, 6), result["L"], result["stationary"]):
+            scalar = MM1CappedPopulation(lmbda, 12.0, m)
+            self.assertAlmostEqual(L, scalar.system_units_amount_mean(), delta=1e-12)
+            np.testing.assert_allclose(stationary, scalar.stationary_distribution(), atol=1e-15)
+
+    def test_evaluate_array_stationary_shape(self):
+        # As many scenarios as states, so a wrong broadcast would go unnoticed.
+        queue = MM1CappedSystem(np.array([1.0, 2.0, 3.0]), 10.0, 2)
+        result = self.cache.evaluate_array(queue)
+        self.assertAlmostEqual(result["stationary"][2, 1], MM1CappedSystem(3.0, 10.0, 2).probability_of_n_units(1), delta=1e-12)
+
+    def test_model_key_rejects_arrays(self):
+        with self.assertRaises(ValueError):
+            model_key(MM1Uncapped(np.array([1.0, 2.0]), 10.0))
+
+    def test_cache_counts(self):
+        queues = [MM1Uncapped(lmbda, 10.0) for lmbda in (1.0, 2.0)]
+        self.cache.evaluate(queues[0])
+        with instrument() as recorder:
+            self.cache.evaluate_many(queues)
+            self.cache.evaluate_array(MM1Uncapped(np.array([1.0, 2.0, 3.0]), 10.0))
+
+        stats = recorder.snapshot()["ResultCache.evaluate"]
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (3, 2))
+
+    def test_eviction(self):
+        with ResultCache(self.path, max_bytes=1000) as small:
+            small.evaluate_many([MM1Uncapped(lmbda / 100, 10.0) for lmbda in range(1, 100)])
+            (total,) = small._connection.execute("SELECT SUM(size) FROM results").fetchone()
+        self.assertLessEqual(total, 1000)
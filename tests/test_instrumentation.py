@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from exercies.instrumentation import instrument
+from exercies.models.mm1 import MM1CappedPopulation
+from exercies.optimization import RepairCostOptimizer
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.queue = MM1CappedPopulation(2.0, 12.0, 5)
+
+    def test_call_counts(self):
+        with instrument() as recorder:
+            self.queue.time_in_system_mean()
+            self.queue.system_units_amount_mean()
+
+        snapshot = recorder.snapshot()
+        self.assertEqual(snapshot["MM1CappedPopulation.probability_of_zero_units"]["calls"], 2)
+        self.assertEqual(snapshot["MM1CappedPopulation.system_units_amount_mean"]["calls"], 1)
+
+    def test_p_n_strategies(self):
+        with instrument() as recorder:
+            self.queue.probability_of_n_units(2, MM1CappedPopulation.PnStrategies.DEFAULT)
+            self.queue.probability_of_n_units(2, MM1CappedPopulation.PnStrategies.RECURSIVE)
+
+        snapshot = recorder.snapshot()
+        self.assertEqual(snapshot["MM1CappedPopulation._p_n_default"]["calls"], 1)
+        self.assertEqual(snapshot["MM1CappedPopulation._p_n_recursive"]["calls"], 2)
+
+    def test_disabled_outside_block(self):
+        original = MM1CappedPopulation.time_in_system_mean
+        with instrument() as recorder:
+            self.assertIsNot(MM1CappedPopulation.time_in_system_mean, original)
+        self.queue.time_in_system_mean()
+
+        self.assertIs(MM1CappedPopulation.time_in_system_mean, original)
+        self.assertEqual(recorder.snapshot(), {})
+
+    def test_other_threads_not_recorded(self):
+        stop = threading.Event()
+        calls_in_block = threading.Event()
+
+        def background():
+            while not stop.is_set():
+                self.queue.time_in_system_mean()
+                if hasattr(MM1CappedPopulation.time_in_system_mean, "__wrapped_original__"):
+                    calls_in_block.set()
+
+        thread = threading.Thread(target=background)
+        thread.start()
+        try:
+            with instrument() as recorder:
+                self.assertTrue(calls_in_block.wait(timeout=5))
+                self.queue.time_in_system_mean()
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(recorder.snapshot()["MM1CappedPopulation.time_in_system_mean"]["calls"], 1)
+
+    def test_cache_counts(self):
+        optimizer = RepairCostOptimizer(2.0, 20, downtime_cost=50, crew_cost=40)
+        with instrument() as recorder:
+            optimizer.cost(2, 12.0)
+            optimizer.cost(2, 12.0)
+
+        stats = recorder.snapshot()["RepairCostOptimizer.cost"]
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (1, 1))
+
+    def test_exports(self):
+        with instrument() as recorder:
+            self.queue.time_in_system_mean()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            recorder.write_json(path)
+            with open(path, encoding="utf-8") as file:
+                self.assertEqual(json.load(file)["MM1CappedPopulation.time_in_system_mean"]["calls"], 1)
+
+        self.assertIn('exercies_call_seconds_count{method="MM1CappedPopulation.time_in_system_mean"} 1', recorder.to_prometheus())
@@ -21,4 +21,16 @@ class TestMM1Uncapped(unittest.TestCase):
     def test_units_outside_system_mean(self):
         a1 = self.queue.units_outside_system_mean()
         a2 = 4.41057
-        self.assertAlmostEqual(a1, a2, delta=1e-2)
\ No newline at end of file
+        self.assertAlmostEqual(a1, a2, delta=1e-2)
+
+    def test_metric_sensitivities(self):
+        h = 1e-6
+        upper = MM1CappedPopulation(self.lmbda, self.mu + h, self.m).time_in_system_mean()
+        lower = MM1CappedPopulation(self.lmbda, self.mu - h, self.m).time_in_system_mean()
+        _, dw_dmu = self.queue.metric_sensitivities()["W"]
+        self.assertAlmostEqual(dw_dmu, (upper - lower) / (2*h), delta=1e-6)
+
+    def test_population_increment_differences(self):
+        a1 = self.queue.population_increment_differences()["L"]
+        a2 = MM1CappedPopulation(self.lmbda, self.mu, self.m + 1).system_units_amount_mean() - self.queue.system_units_amount_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-12)
\ No newline at end of file
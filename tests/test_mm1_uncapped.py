@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from exercies.models.mm1 import MM1Uncapped
 
 class TestMM1Uncapped(unittest.TestCase):
@@ -25,4 +26,14 @@ class TestMM1Uncapped(unittest.TestCase):
     def test_probability_of_waiting_over(self):
         a1 = self.queue.probability_of_waiting_over(7/60)
         a2 = 0.372
-        self.assertAlmostEqual(a1, a2, delta=1e-2)
\ No newline at end of file
+        self.assertAlmostEqual(a1, a2, delta=1e-2)
+
+    def test_metric_sensitivities(self):
+        dl_dlmbda, dl_dmu = self.queue.metric_sensitivities()["L"]
+        self.assertAlmostEqual(dl_dlmbda, self.mu / (self.mu - self.lmbda)**2, delta=1e-9)
+        self.assertAlmostEqual(dl_dmu, -self.lmbda / (self.mu - self.lmbda)**2, delta=1e-9)
+
+    def test_metric_sensitivities_vectorized(self):
+        queue = MM1Uncapped(np.array([5.0, 10.0]), self.mu)
+        dw_dlmbda, _ = queue.metric_sensitivities()["W"]
+        np.testing.assert_allclose(dw_dlmbda, [1/100, 1/25])
\ No newline at end of file
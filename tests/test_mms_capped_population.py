@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from exercies.models.mm1 import MM1CappedPopulation
+from exercies.models.mms import MMSCappedPopulation
+
+class TestMMSCappedPopulation(unittest.TestCase):
+    def setUp(self):
+        self.lmbda = 1.0/4.0
+        self.mu = 3.0/2.0
+        self.m = 6
+        self.queue = MMSCappedPopulation(self.lmbda, self.mu, 2, self.m)
+
+    def test_single_server_matches_mm1(self):
+        a1 = MMSCappedPopulation(self.lmbda, self.mu, 1, self.m).system_units_amount_mean()
+        a2 = MM1CappedPopulation(self.lmbda, self.mu, self.m).system_units_amount_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-9)
+
+    def test_probability_of_zero_units(self):
+        a1 = self.queue.probability_of_zero_units()
+        a2 = 0.38513
+        self.assertAlmostEqual(a1, a2, delta=1e-4)
+
+    def test_littles_law(self):
+        a1 = self.queue.time_in_system_mean() - self.queue.time_in_queue_mean()
+        a2 = self.queue.time_of_service_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-9)
+
+    def test_metric_sensitivities(self):
+        h = 1e-6
+        sensitivities = self.queue.metric_sensitivities()
+        for name, method in (("L", "system_units_amount_mean"), ("Wq", "time_in_queue_mean")):
+            upper = getattr(MMSCappedPopulation(self.lmbda + h, self.mu, 2, self.m), method)()
+            lower = getattr(MMSCappedPopulation(self.lmbda - h, self.mu, 2, self.m), method)()
+            self.assertAlmostEqual(sensitivities[name][0], (upper - lower) / (2*h), delta=1e-6)
+            upper = getattr(MMSCappedPopulation(self.lmbda, self.mu + h, 2, self.m), method)()
+            lower = getattr(MMSCappedPopulation(self.lmbda, self.mu - h, 2, self.m), method)()
+            self.assertAlmostEqual(sensitivities[name][1], (upper - lower) / (2*h), delta=1e-6)
+
+    def test_metric_sensitivities_vectorized(self):
+        lmbdas = np.array([[self.lmbda, 0.5], [2.0, 0.01]])
+        sensitivities = MMSCappedPopulation(lmbdas, self.mu, 2, self.m).metric_sensitivities()
+        for (i, j), lmbda in np.ndenumerate(lmbdas):
+            scalar = MMSCappedPopulation(lmbda, self.mu, 2, self.m).metric_sensitivities()
+            for name, (d_lmbda, d_mu) in scalar.items():
+                self.assertAlmostEqual(sensitivities[name][0][i, j], d_lmbda, delta=1e-12)
+                self.assertAlmostEqual(sensitivities[name][1][i, j], d_mu, delta=1e-12)
+
+    def test_vectorized_metrics(self):
+        queue = MMSCappedPopulation(np.array([self.lmbda, 0.5]), self.mu, 2, self.m)
+        self.assertEqual(queue.stationary_distribution().shape, (2, self.m + 1))
+        self.assertAlmostEqual(queue.time_in_queue_mean()[0], self.queue.time_in_queue_mean(), delta=1e-12)
+
+    def test_servers_increment_differences(self):
+        a1 = self.queue.servers_increment_differences()["L"]
+        a2 = MMSCappedPopulation(self.lmbda, self.mu, 3, self.m).system_units_amount_mean() - self.queue.system_units_amount_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-12)
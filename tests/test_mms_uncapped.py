@@ -16,4 +16,16 @@ class TestMMSUncapped(unittest.TestCase):
     def test_time_in_system_mean(self):
         a1 = self.queue.time_in_system_mean()
         a2 = 4.444444/80.0
-        self.assertAlmostEqual(a1, a2, delta=1e-2)
\ No newline at end of file
+        self.assertAlmostEqual(a1, a2, delta=1e-2)
+
+    def test_metric_sensitivities(self):
+        h = 1e-6
+        upper = MMSUncapped(self.lmbda + h, self.mu, self.s).system_units_amount_mean()
+        lower = MMSUncapped(self.lmbda - h, self.mu, self.s).system_units_amount_mean()
+        dl_dlmbda, _ = self.queue.metric_sensitivities()["L"]
+        self.assertAlmostEqual(dl_dlmbda, (upper - lower) / (2*h), delta=1e-6)
+
+    def test_servers_increment_differences(self):
+        a1 = self.queue.servers_increment_differences()["W"]
+        a2 = MMSUncapped(self.lmbda, self.mu, self.s + 1).time_in_system_mean() - self.queue.time_in_system_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-12)
\ No newline at end of file
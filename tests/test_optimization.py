@@ -0,0 +1,27 @@
+import unittest
+from exercies.models.mms import MMSCappedPopulation
+from exercies.optimization import RepairCostOptimizer
+
+class TestRepairCostOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.lmbda = 2.0
+        self.m = 30
+        self.mus = [4.0, 6.0, 8.0, 12.0, 16.0, 24.0]
+        self.optimizer = RepairCostOptimizer(self.lmbda, self.m, downtime_cost=50, crew_cost=40, speed_cost=3)
+
+    def test_system_units_amount_mean(self):
+        a1 = self.optimizer.system_units_amount_mean(3, 8.0)
+        a2 = MMSCappedPopulation(self.lmbda, 8.0, 3, self.m).system_units_amount_mean()
+        self.assertAlmostEqual(a1, a2, delta=1e-9)
+
+    def test_optimal_crews_matches_exhaustive_search(self):
+        for mu in self.mus:
+            for start in (1, 15, self.m):
+                a1 = self.optimizer.optimal_crews(mu, start).crews
+                a2 = min(range(1, self.m + 1), key=lambda s: self.optimizer.cost(s, mu))
+                self.assertEqual(a1, a2)
+
+    def test_optimize(self):
+        a1 = self.optimizer.optimize(self.mus)
+        a2 = min((self.optimizer.cost(s, mu), s, mu) for s in range(1, self.m + 1) for mu in self.mus)
+        self.assertEqual((a1.cost, a1.crews, a1.mu), a2)
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Seconds allowed to import the package and solve the exercise model.
+STARTUP_BUDGET = 0.05
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from exercies import run_exercies
+from exercies.models import MM1CappedPopulation
+MM1CappedPopulation(2, 12, 5).time_in_system_mean()
+print(time.perf_counter() - start, "numpy" in sys.modules)
+"""
+
+class TestStartup(unittest.TestCase):
+    def run_script(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", SCRIPT], cwd=root, capture_output=True, text=True, check=True).stdout
+        elapsed, numpy_loaded = output.split()
+        return float(elapsed), numpy_loaded == "True"
+
+    def test_scalar_path_does_not_import_numpy(self):
+        _, numpy_loaded = self.run_script()
+        self.assertFalse(numpy_loaded)
+
+    def test_import_time_budget(self):
+        # Best of a few runs, to keep scheduler noise out of the measurement.
+        elapsed = min(self.run_script()[0] for _ in range(3))
+        self.assertLess(elapsed, STARTUP_BUDGET)
@@ -0,0 +1,28 @@
+import unittest
+from exercies.validation import MODELS, analytic_metrics, numeric_metrics, run_validation, simulated_metrics, summarize
+
+class TestValidation(unittest.TestCase):
+    def test_analytic_matches_numeric(self):
+        records = run_validation(samples=40, workers=0, simulate_fraction=0)
+        self.assertFalse([record for record in records if "error" in record])
+
+        summary = summarize(records)
+        self.assertEqual({model for model, _, _ in summary}, set(MODELS))
+        for key, fields in summary.items():
+            for field, (_, _, max_error) in fields.items():
+                self.assertLess(max_error, 1e-6, f"{key} {field}")
+
+    def test_factorial_overflow_region(self):
+        # 171! doesn't fit in a float.
+        for name, params in (("MM1CappedPopulation", {"lmbda": 0.001, "mu": 1.0, "m": 171}),
+                             ("MMSUncapped", {"lmbda": 1.0, "mu": 1.0, "s": 171})):
+            a1 = analytic_metrics(name, params)
+            a2 = numeric_metrics(name, params)
+            for field in ("L", "W", "P0"):
+                self.assertAlmostEqual(a1[field], a2[field], delta=1e-9 * max(a2[field], 1))
+
+    def test_simulation_matches_numeric(self):
+        params = {"lmbda": 3.0, "mu": 2.0, "s": 2}
+        a1 = simulated_metrics("MMSUncapped", params, events=200_000, seed=1)["L"]
+        a2 = numeric_metrics("MMSUncapped", params)["L"]
+        self.assertAlmostEqual(a1, a2, delta=0.05 * a2)